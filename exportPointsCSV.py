@@ -17,16 +17,65 @@
 # Usage:
 # 1. Select a robot routine containing motion statements
 # 2. Run the export command
-# 3. Choose CSV file location and format
+# 3. Choose export format and CSV file location
 # 4. Points are exported from PTP, LIN, PATH, and CUSTOM motion statements
 # -------------------------------------------------------------------------------
 
 from vcCommand import *
+import itertools
 import math
+import operator
+import os
+import tempfile
 
 # Get Visual Components application instance
 app = getApplication()
 
+# Save-file dialog command, looked up once at load; OnStart falls back to a
+# fresh lookup if it was not available yet
+try:
+    _SAVE_CMD = app.findCommand("dialogSave")
+except Exception:
+    _SAVE_CMD = None
+
+# Set to True to print diagnostic output while exporting
+DEBUG = False
+
+# Maximum number of per-statement warnings printed before summarizing
+_MAX_WARNINGS = 3
+
+# Statement types points are extracted from, resolved once at import.
+# Constants missing from this Visual Components version are skipped
+# (path statements are then detected by position count).
+_OK_TYPES = frozenset(
+    globals()[name]
+    for name in (
+        "VC_STATEMENT_PTPMOTION",
+        "VC_STATEMENT_LINMOTION",
+        "VC_STATEMENT_CUSTOM",
+        "VC_STATEMENT_PATH",
+    )
+    if name in globals()
+)
+
+# Angle conversion constants
+_PI = math.pi
+_RAD2DEG = 180.0 / math.pi
+
+# Joint value sources, in order of preference
+_JOINT_SOURCES = (
+    operator.attrgetter("JointValues"),
+    operator.attrgetter("Frame.JointValues"),
+    operator.attrgetter("Frame.JointConfiguration"),
+)
+_FRAME_JOINT_SOURCES = _JOINT_SOURCES[1:]
+
+# Rows formatted per chunk (roughly 64 KiB of CSV text)
+_CHUNK_ROWS = 1024
+
+# Buffered bytes that trigger a write to the output file
+_FLUSH_BYTES = 1024 * 1024
+
 
 def OnStart():
     """
@@ -34,9 +83,10 @@ def OnStart():
 
     Workflow:
     1. Validate active robot routine
-    2. Open file dialog for CSV save location
-    3. Extract points from robot motion statements
-    4. Export data to CSV file with user-selected format
+    2. Ask for the export format
+    3. Open file dialog for CSV save location
+    4. Extract points from robot motion statements
+    5. Export data to CSV file with user-selected format
     """
     # Validate that a robot routine is active
     active_routine = app.TeachContext.ActiveRoutine
@@ -44,10 +94,16 @@ def OnStart():
         print("Error: Please select a robot routine first.")
         return False
 
+    # Ask user for export format
+    export_format = get_export_format()
+    if export_format is None:
+        print("Export cancelled by user")
+        return False
+
     # Open file dialog for CSV save location
     uri = ""
     ok = True
-    save_cmd = app.findCommand("dialogSave")
+    save_cmd = _SAVE_CMD or app.findCommand("dialogSave")
     filefilter = "CSV table (*.csv)|*.csv|All files (*.*)|*.*"
     save_cmd.execute(uri, ok, filefilter)
 
@@ -60,23 +116,24 @@ def OnStart():
     uri = save_cmd.Param_1
     fileuri = uri[8:]  # Remove 'file://' prefix
 
-    # Ask user for export format
-    export_format = get_export_format()
-    if export_format is None:
-        print("Export cancelled by user")
-        return False
-
-    # Extract points from routine
+    # Extract points from routine, peeking at the first one to detect empty routines
     points_data = extract_points_from_routine(active_routine, export_format)
-    if not points_data:
+    try:
+        first_point = next(points_data, None)
+    except Exception as e:
+        print("Error extracting points from routine: %s" % str(e))
+        return False
+    if first_point is None:
         print("No valid points found in routine to export")
         return False
 
-    # Write data to CSV file
-    success = write_csv_file(fileuri, points_data, export_format)
+    # Stream points into the CSV file
+    exported_count = write_csv_file(
+        fileuri, itertools.chain([first_point], points_data), export_format
+    )
 
-    if success:
-        print("Successfully exported %d points to '%s'" % (len(points_data), fileuri))
+    if exported_count:
+        print("Successfully exported %d points to '%s'" % (exported_count, fileuri))
         return True
     else:
         print("Failed to export points to CSV file")
@@ -129,171 +186,163 @@ def extract_points_from_routine(routine, export_format):
     """
     Extract points from robot routine motion statements.
 
+    Points are yielded as they are extracted so they can be streamed into
+    the CSV file without building an intermediate list.
+
     Args:
         routine: Visual Components routine object
         export_format: Export format ('position_only', 'full_pose', or 'joint_angles')
 
-    Returns:
-        list: List of point data tuples
+    Yields:
+        tuple: Point data tuple
     """
-    # Define valid statement types for point extraction
-    try:
-        ok_types = [
-            VC_STATEMENT_PTPMOTION,
-            VC_STATEMENT_LINMOTION,
-            VC_STATEMENT_CUSTOM,
-        ]
-        # Try to add path motion if constant exists
-        try:
-            ok_types.append(VC_STATEMENT_PATH)
-        except NameError:
-            pass  # PATH constant not available, will detect by position count
-    except NameError:
-        # Fallback if constants aren't available
-        ok_types = [
-            VC_STATEMENT_PTPMOTION,
-            VC_STATEMENT_LINMOTION,
-            VC_STATEMENT_CUSTOM,
-        ]
-
-    points_data = []
+    failed_count = 0
+    # Attribute availability per (statement type, position class), resolved
+    # from the first position of each combination
+    probe_cache = {}
+    joint_angles_mode = export_format == "joint_angles"
+    position_only_mode = export_format == "position_only"
 
     for statement in routine.Statements:
         # Check if statement type is valid OR if it has multiple positions (path statement)
-        is_valid = statement.Type in ok_types
-        has_multiple_positions = (
-            hasattr(statement, "Positions")
-            and statement.Positions
-            and len(statement.Positions) > 1
-        )
+        if statement.Type in _OK_TYPES:
+            positions = getattr(statement, "Positions", None)
+            num_positions = len(positions) if positions else 0
+            if num_positions == 0:
+                continue
+        else:
+            # Only probe Positions for statements of other types
+            positions = getattr(statement, "Positions", None)
+            if not positions or len(positions) <= 1:
+                continue
+            num_positions = len(positions)
 
-        if is_valid or has_multiple_positions:
-            try:
-                # Get number of positions in statement (paths may have multiple positions)
-                num_positions = len(statement.Positions) if statement.Positions else 0
-
-                # For path statements, extract all positions
-                # For other statements, typically only extract the first position
-                # Path statements typically have multiple positions, so check count
-                if num_positions > 1:
-                    # Likely a path - extract all positions
-                    positions_to_extract = num_positions
+        try:
+            # Path statements contribute all of their positions,
+            # regular motions have a single position
+            for pos_idx in range(num_positions):
+                position = positions[pos_idx]
+                if not position:
+                    continue
+
+                probe_key = (statement.Type, type(position))
+                probes = probe_cache.get(probe_key)
+
+                if joint_angles_mode:
+                    if probes is None:
+                        probes = probe_cache[probe_key] = _probe_joint_sources(
+                            position
+                        )
+                    # Extract joint angles from position (for path, each position may have different joint config)
+                    joint_angles = get_joint_angles_from_position(position, probes)
+                    if joint_angles:
+                        yield joint_angles
                 else:
-                    # Regular motion - extract first position only
-                    positions_to_extract = 1 if num_positions > 0 else 0
-
-                for pos_idx in range(positions_to_extract):
-                    position = statement.Positions[pos_idx]
-                    if not position:
+                    # Get transformation matrix
+                    transform = position.PositionInReference
+                    if not transform:
                         continue
 
-                    if export_format == "joint_angles":
-                        # Extract joint angles from position (for path, each position may have different joint config)
-                        joint_angles = get_joint_angles_from_position(position)
-                        if joint_angles:
-                            points_data.append(joint_angles)
-                    else:
-                        # Get transformation matrix
-                        transform = position.PositionInReference
-                        if not transform:
-                            continue
-
-                        # Extract position coordinates
-                        x = transform.P.X
-                        y = transform.P.Y
-                        z = transform.P.Z
-
-                        if export_format == "position_only":
-                            points_data.append((x, y, z))
-                        else:  # full_pose
-                            # Try to get WPR from position object first, then from matrix
-                            w, p, r = get_wpr_from_position(position, transform)
-                            points_data.append((x, y, z, w, p, r))
-
-            except Exception as e:
+                    # Extract position coordinates (read the P vector once)
+                    p_vec = transform.P
+                    x, y, z = p_vec.X, p_vec.Y, p_vec.Z
+
+                    if position_only_mode:
+                        yield (x, y, z)
+                    else:  # full_pose
+                        if probes is None:
+                            probes = probe_cache[probe_key] = _probe_wpr_sources(
+                                position, transform
+                            )
+                        # Try to get WPR from position object first, then from matrix
+                        w, p, r = get_wpr_from_position(position, transform, probes)
+                        yield (x, y, z, w, p, r)
+
+        except (AttributeError, TypeError, ValueError) as e:
+            failed_count += 1
+            if failed_count <= _MAX_WARNINGS:
                 print("Warning: Failed to extract point from statement: %s" % str(e))
-                continue
+            continue
 
-    return points_data
+    if failed_count:
+        print("Warning: Skipped %d statements that failed to extract" % failed_count)
 
 
-def get_joint_angles_from_position(position):
+def _probe_joint_sources(position):
+    """
+    Detect which joint value sources a position type provides.
+
+    Positions of the same statement type and class expose the same
+    attributes, so the result can be reused for them instead of probing
+    attributes each time.
+
+    Args:
+        position: Sample Visual Components position object
+
+    Returns:
+        tuple: Getters from _JOINT_SOURCES that the position supports
+    """
+    # Frame type unknown from this sample, keep probing Frame sources at runtime
+    frame_unknown = hasattr(position, "Frame") and not position.Frame
+
+    sources = []
+    for source in _JOINT_SOURCES:
+        try:
+            source(position)
+        except AttributeError:
+            if not (frame_unknown and source in _FRAME_JOINT_SOURCES):
+                continue
+        sources.append(source)
+    return tuple(sources)
+
+
+def get_joint_angles_from_position(position, probes=None):
     """
     Extract joint angles from a position object.
 
     Args:
         position: Visual Components position object
+        probes: Optional result of _probe_joint_sources for this position type
 
     Returns:
         tuple: Joint angles in degrees, or None if failed
     """
     try:
-        # Method 1: Try to get from position's JointValues
-        if hasattr(position, "JointValues") and position.JointValues:
-            joint_values = position.JointValues
-            if joint_values and len(joint_values) > 0:
-                print(
-                    "Found joint values via position.JointValues: %d joints"
-                    % len(joint_values)
-                )
-                # Check if values are already in degrees or radians
-                joint_angles = []
-                for val in joint_values:
-                    # If value is > π (3.14) in absolute value, it's likely already in degrees
-                    if abs(val) > math.pi:
-                        joint_angles.append(val)  # Already in degrees
-                    else:
-                        joint_angles.append(
-                            val * 180.0 / math.pi
-                        )  # Convert from radians
-                return tuple(joint_angles)
-
-        # Method 2: Try to get from the position frame
-        if hasattr(position, "Frame") and position.Frame:
-            frame = position.Frame
-            if hasattr(frame, "JointValues") and frame.JointValues:
-                joint_values = frame.JointValues
-                if joint_values and len(joint_values) > 0:
-                    print(
-                        "Found joint values via frame.JointValues: %d joints"
-                        % len(joint_values)
-                    )
-                    joint_angles = []
-                    for val in joint_values:
-                        # If value is > π (3.14) in absolute value, it's likely already in degrees
-                        if abs(val) > math.pi:
-                            joint_angles.append(val)  # Already in degrees
-                        else:
-                            joint_angles.append(
-                                val * 180.0 / math.pi
-                            )  # Convert from radians
-                    return tuple(joint_angles)
-
-            # Try alternative: get joint configuration from frame
-            if hasattr(frame, "JointConfiguration") and frame.JointConfiguration:
-                joint_config = frame.JointConfiguration
-                if joint_config and len(joint_config) > 0:
-                    print(
-                        "Found joint configuration via frame.JointConfiguration: %d joints"
-                        % len(joint_config)
-                    )
-                    joint_angles = []
-                    for val in joint_config:
-                        # Check if value is already in degrees or radians
-                        if abs(val) > math.pi:
-                            joint_angles.append(val)  # Already in degrees
-                        else:
-                            joint_angles.append(
-                                val * 180.0 / math.pi
-                            )  # Convert from radians
-                    return tuple(joint_angles)
+        # Use the first source that provides joint values
+        sources = _JOINT_SOURCES if probes is None else probes
+        for source in sources:
+            try:
+                joint_values = source(position)
+            except AttributeError:
+                continue
+            if joint_values:
+                return _convert_joints(joint_values)
 
+        # The probed subset found nothing, so try every source before giving up
+        if sources is not _JOINT_SOURCES:
+            return get_joint_angles_from_position(position)
         return None
     except Exception as e:
         print("Warning: Failed to extract joint angles from position: %s" % str(e))
         return None
 
 
+def _convert_joints(values):
+    """
+    Convert joint values to degrees.
+
+    Values larger than pi in absolute value are assumed to already be in
+    degrees; anything else is treated as radians.
+
+    Args:
+        values: Sequence of joint values
+
+    Returns:
+        tuple: Joint angles in degrees
+    """
+    return tuple(v if abs(v) > _PI else v * _RAD2DEG for v in values)
+
+
 def get_joint_angles_from_statement(statement):
     """
     Extract joint angles from a motion statement (for backward compatibility).
@@ -319,7 +368,44 @@ def get_joint_angles_from_statement(statement):
         return None
 
 
-def get_wpr_from_position(position, transform):
+def _probe_wpr_sources(position, transform):
+    """
+    Detect which WPR sources a position and its matrix provide.
+
+    Args:
+        position: Sample Visual Components position object
+        transform: Sample vcMatrix transformation matrix
+
+    Returns:
+        tuple: (has_wpr, has_frame_wpr, has_get_wpr)
+    """
+    frame = position.Frame if hasattr(position, 'Frame') else None
+    if frame:
+        has_frame_wpr = hasattr(frame, 'WPR')
+    else:
+        # Frame type unknown from this sample, keep probing at runtime
+        has_frame_wpr = hasattr(position, 'Frame')
+    return (hasattr(position, 'WPR'), has_frame_wpr, hasattr(transform, 'getWPR'))
+
+
+def _wpr_to_degrees(w, p, r):
+    """
+    Convert W,P,R angles to degrees.
+
+    If all three values are small (< 10) they are assumed to be radians,
+    otherwise they are returned unchanged.
+
+    Args:
+        w, p, r: Orientation angles
+
+    Returns:
+        tuple: (W, P, R) angles in degrees
+    """
+    scale = 1.0 if max(abs(w), abs(p), abs(r)) >= 10.0 else _RAD2DEG
+    return (w * scale, p * scale, r * scale)
+
+
+def get_wpr_from_position(position, transform, probes=None):
     """
     Extract WPR angles from a position object or transformation matrix.
     Tries multiple methods to get the correct WPR values that match Visual Components display.
@@ -327,46 +413,41 @@ def get_wpr_from_position(position, transform):
     Args:
         position: Visual Components position object
         transform: vcMatrix transformation matrix
+        probes: Optional result of _probe_wpr_sources for this position type
         
     Returns:
         tuple: (W, P, R) angles in degrees
     """
+    if probes is None:
+        probes = _probe_wpr_sources(position, transform)
+    has_wpr, has_frame_wpr, has_get_wpr = probes
+
     # Method 1: Try to get WPR directly from position object
     try:
-        if hasattr(position, 'WPR'):
+        if has_wpr:
             wpr = position.WPR
             if wpr and len(wpr) >= 3:
-                # Check if values are in degrees or radians
-                w, p, r = wpr[0], wpr[1], wpr[2]
-                # If values are small (< 10), they might be in radians
-                if abs(w) < 10 and abs(p) < 10 and abs(r) < 10:
-                    return (w * 180.0 / math.pi, p * 180.0 / math.pi, r * 180.0 / math.pi)
-                return (w, p, r)
+                return _wpr_to_degrees(wpr[0], wpr[1], wpr[2])
     except Exception as e:
         pass
     
     # Method 2: Try to get WPR from position frame
     try:
-        if hasattr(position, 'Frame') and position.Frame:
-            frame = position.Frame
+        frame = getattr(position, 'Frame', None) if has_frame_wpr else None
+        if frame:
             if hasattr(frame, 'WPR'):
                 wpr = frame.WPR
                 if wpr and len(wpr) >= 3:
-                    w, p, r = wpr[0], wpr[1], wpr[2]
-                    if abs(w) < 10 and abs(p) < 10 and abs(r) < 10:
-                        return (w * 180.0 / math.pi, p * 180.0 / math.pi, r * 180.0 / math.pi)
-                    return (w, p, r)
+                    return _wpr_to_degrees(wpr[0], wpr[1], wpr[2])
     except Exception as e:
         pass
     
     # Method 3: Try matrix getWPR method (if available)
     try:
-        if hasattr(transform, 'getWPR'):
-            w, p, r = transform.getWPR()
+        if has_get_wpr:
             # getWPR might return radians, check and convert if needed
-            if abs(w) < 10 and abs(p) < 10 and abs(r) < 10:
-                return (w * 180.0 / math.pi, p * 180.0 / math.pi, r * 180.0 / math.pi)
-            return (w, p, r)
+            w, p, r = transform.getWPR()
+            return _wpr_to_degrees(w, p, r)
     except Exception as e:
         pass
     
@@ -387,10 +468,11 @@ def matrix_to_wpr(matrix):
     """
     try:
         # Manual calculation using ZYX Euler angles (Visual Components convention)
-        # Extract rotation matrix components
-        nx, ny, nz = matrix.N.X, matrix.N.Y, matrix.N.Z
-        ox, oy, oz = matrix.O.X, matrix.O.Y, matrix.O.Z
-        ax, ay, az = matrix.A.X, matrix.A.Y, matrix.A.Z
+        # Extract rotation matrix components (fetch each axis vector once)
+        n_vec, o_vec, a_vec = matrix.N, matrix.O, matrix.A
+        nx, ny, nz = n_vec.X, n_vec.Y, n_vec.Z
+        ox, oy, oz = o_vec.X, o_vec.Y, o_vec.Z
+        ax, ay, az = a_vec.X, a_vec.Y, a_vec.Z
 
         # ZYX Euler angles (WPR) - Visual Components convention:
         # W (Yaw) - rotation around Z axis
@@ -399,11 +481,11 @@ def matrix_to_wpr(matrix):
         
         # Calculate P (Pitch) first: P = asin(-nz)
         p_rad = math.asin(-nz)
-        p = p_rad * 180.0 / math.pi
-        
+
         # Check for gimbal lock (cos(P) close to zero)
-        cos_p = math.cos(p_rad)
-        if abs(cos_p) < 1e-6:
+        # cos(asin(x)) == sqrt(1 - x^2), so no extra trig call is needed
+        cos_p = math.sqrt(max(0.0, 1.0 - nz * nz))
+        if cos_p < 1e-6:
             # Gimbal lock case: P = ±90 degrees
             # W and R are not uniquely determined
             w_rad = math.atan2(ox, ax)
@@ -412,63 +494,212 @@ def matrix_to_wpr(matrix):
             # Normal case: extract W and R using the standard ZYX formula
             w_rad = math.atan2(ny, nx)
             r_rad = math.atan2(oz, az)
-        
-        w = w_rad * 180.0 / math.pi
-        r = r_rad * 180.0 / math.pi
 
-        return (w, p, r)
+        return (w_rad * _RAD2DEG, p_rad * _RAD2DEG, r_rad * _RAD2DEG)
 
     except Exception as e:
         print("Warning: Failed to convert matrix to WPR: %s" % str(e))
-        import traceback
-        traceback.print_exc()
+        if DEBUG:
+            import traceback
+
+            traceback.print_exc()
         return (0.0, 0.0, 0.0)
 
 
+def _format_xyz_rows(rows):
+    """
+    Format position-only rows as CSV text.
+
+    Args:
+        rows: List of (X, Y, Z) tuples
+
+    Returns:
+        str: CSV lines, each terminated by a newline
+    """
+    # Format: X,Y,Z
+    return "".join(map("%.6f,%.6f,%.6f\n".__mod__, rows))
+
+
+def _format_xyzwpr_rows(rows):
+    """
+    Format full pose rows as CSV text.
+
+    Args:
+        rows: List of (X, Y, Z, W, P, R) tuples
+
+    Returns:
+        str: CSV lines, each terminated by a newline
+    """
+    # Format: X,Y,Z,W,P,R
+    return "".join(map("%.6f,%.6f,%.6f,%.6f,%.6f,%.6f\n".__mod__, rows))
+
+
+def _format_joint_rows(rows):
+    """
+    Format joint angle rows as CSV text.
+
+    Args:
+        rows: Non-empty list of joint angle tuples (variable number of joints)
+
+    Returns:
+        str: CSV lines, each terminated by a newline
+    """
+    # Format: J1,J2,J3,...,J6
+    # Points of a routine usually share one joint count, so use a single
+    # template for the whole chunk and only fall back to per-row lookups
+    joint_count = len(rows[0])
+    joint_fmt = _joint_format(joint_count)
+    if all(len(point) == joint_count for point in rows):
+        return "".join(map(joint_fmt.__mod__, rows))
+
+    lines = []
+    for point in rows:
+        lines.append(_joint_format(len(point)) % point)
+    return "".join(lines)
+
+
+def _joint_format(joint_count):
+    """
+    Get the cached CSV row template for a joint count.
+
+    Args:
+        joint_count: Number of joint values per row
+
+    Returns:
+        str: Row template terminated by a newline
+    """
+    joint_fmt = _JOINT_FORMATS.get(joint_count)
+    if joint_fmt is None:
+        joint_fmt = ",".join(["%.6f"] * joint_count) + "\n"
+        _JOINT_FORMATS[joint_count] = joint_fmt
+    return joint_fmt
+
+
+# Row formatters per export format, and joint templates keyed by joint count
+_ROW_FORMATTERS = {
+    "position_only": _format_xyz_rows,
+    "full_pose": _format_xyzwpr_rows,
+    "joint_angles": _format_joint_rows,
+}
+_JOINT_FORMATS = {}
+
+
+def _write_buffer(fd, buf):
+    """
+    Write and empty a byte buffer, retrying on partial writes.
+
+    Args:
+        fd: Open file descriptor
+        buf: bytearray to write; cleared in place
+    """
+    while buf:
+        del buf[: os.write(fd, buf)]
+
+
+def _replace_file(src, dst):
+    """
+    Move a file over an existing destination.
+
+    Args:
+        src: Path of the file to move
+        dst: Destination path, replaced if it exists
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # os.rename does not overwrite an existing file on Windows, so move
+        # the old file aside and put it back if the second rename fails
+        if not os.path.exists(dst):
+            raise
+        backup = src + ".bak"
+        os.rename(dst, backup)
+        try:
+            os.rename(src, dst)
+        except OSError:
+            os.rename(backup, dst)
+            raise
+        try:
+            os.remove(backup)
+        except OSError:
+            pass
+
+
 def write_csv_file(filepath, points_data, export_format):
     """
     Write points data to CSV file.
 
+    Points are formatted and written in chunks, so points_data may be any
+    iterable, including the generator returned by extract_points_from_routine.
+    The data goes to a temporary file that only replaces filepath once every
+    point has been extracted and written, so a failed export leaves any
+    existing file untouched.
+
     Args:
         filepath: Path to output CSV file
-        points_data: List of point data tuples
+        points_data: Iterable of point data tuples
         export_format: Export format ('position_only', 'full_pose', or 'joint_angles')
 
     Returns:
-        bool: True if successful, False otherwise
+        int: Number of points written, or 0 if extraction or writing failed
     """
-    try:
-        with open(filepath, "w") as output_file:
-            for point in points_data:
-                if export_format == "position_only":
-                    # Format: X,Y,Z
-                    line = "%.6f,%.6f,%.6f" % (point[0], point[1], point[2])
-                elif export_format == "full_pose":
-                    # Format: X,Y,Z,W,P,R
-                    line = "%.6f,%.6f,%.6f,%.6f,%.6f,%.6f" % (
-                        point[0],
-                        point[1],
-                        point[2],
-                        point[3],
-                        point[4],
-                        point[5],
-                    )
-                else:  # joint_angles
-                    # Format: J1,J2,J3,J4,J5,J6 (variable number of joints)
-                    # Write all joint angles separated by commas
-                    joint_strings = ["%.6f" % angle for angle in point]
-                    line = ",".join(joint_strings)
-
-                output_file.write(line + "\n")
+    # Pick the chunk formatter once, outside the write loop
+    format_rows = _ROW_FORMATTERS.get(export_format, _format_joint_rows)
 
-        return True
+    points = iter(points_data)
+    point_count = 0
+    temp_path = None
+    complete = False
 
-    except IOError as e:
+    try:
+        # Write pre-encoded ASCII chunks straight to a raw file descriptor,
+        # bypassing the io stack (mkstemp opens it in binary mode, so Windows
+        # does not translate newlines). The unique name never clobbers an
+        # existing file, and the same directory keeps the final rename local.
+        fd, temp_path = tempfile.mkstemp(
+            suffix=".tmp",
+            prefix=os.path.basename(filepath) + ".",
+            dir=os.path.dirname(os.path.abspath(filepath)),
+        )
+        try:
+            # mkstemp creates the file owner-only; use the usual CSV permissions
+            os.chmod(temp_path, 0o644)
+            # Collect chunks in one byte buffer and only write when it fills up,
+            # so typical exports reach the file in a single write
+            buf = bytearray()
+            while True:
+                # Points are extracted lazily here, so report extraction
+                # failures separately from file errors
+                try:
+                    rows = list(itertools.islice(points, _CHUNK_ROWS))
+                except Exception as e:
+                    print("Error extracting points from routine: %s" % str(e))
+                    return 0
+                if not rows:
+                    break
+                buf.extend(format_rows(rows).encode("ascii"))
+                point_count += len(rows)
+                if len(buf) >= _FLUSH_BYTES:
+                    _write_buffer(fd, buf)
+            _write_buffer(fd, buf)
+        finally:
+            os.close(fd)
+
+        _replace_file(temp_path, filepath)
+        complete = True
+        return point_count
+
+    except OSError as e:
         print("Error writing file: %s" % str(e))
-        return False
+        return 0
     except Exception as e:
         print("Error writing CSV data: %s" % str(e))
-        return False
+        return 0
+    finally:
+        if temp_path and not complete:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
 
 
 addState(None)
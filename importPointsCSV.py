@@ -17,12 +17,32 @@
 
 from vcCommand import *
 import vcMatrix
+import vcVector
 import os.path
 import math
+import array
+import csv
+import traceback
 
 # Get Visual Components application instance
 app = getApplication()
 
+# Open-file dialog command, looked up once at load; OnStart falls back to a
+# fresh lookup if it was not available yet
+try:
+    _OPEN_CMD = app.findCommand("dialogOpen")
+except Exception:
+    _OPEN_CMD = None
+
+# Set to True to print diagnostic output while importing
+DEBUG = False
+
+# Degrees to radians factor for forward kinematics input
+_DEG2RAD = math.pi / 180.0
+
+# Maximum number of distinct orientations cached during a coordinate import
+_MAX_CACHED_ORIENTATIONS = 1024
+
 
 def get_import_format():
     """
@@ -68,7 +88,7 @@ def OnStart():
     # Open file dialog for CSV selection
     uri = ""
     ok = True
-    open_cmd = app.findCommand("dialogOpen")
+    open_cmd = _OPEN_CMD or app.findCommand("dialogOpen")
     filefilter = "CSV table (*.csv)|*.csv|All files (*.*)|*.*"
     open_cmd.execute(uri, ok, filefilter)
 
@@ -85,9 +105,9 @@ def OnStart():
         ".", "_"
     )  # Replace dots with underscores for routine name
 
-    # Read and parse CSV file
+    # Read CSV file as raw bytes (no decoding or newline translation)
     try:
-        with open(fileuri, "r") as output:
+        with open(fileuri, "rb") as output:
             input_data = output.read()
     except IOError as e:
         print("Error reading file: %s" % str(e))
@@ -136,261 +156,427 @@ def parse_csv_data(input_data, routine, import_format):
     Parse CSV data and create robot motion statements.
 
     Args:
-        input_data (str): Raw CSV file content
+        input_data (bytes): Raw CSV file content
         routine: Visual Components routine object to add statements to
         import_format: Import format ('coordinates' or 'joint_angles')
 
     Returns:
         int: Number of successfully imported points
     """
-    lines = input_data.split("\n")
+    # Normalize separators once for the whole buffer (support both comma and semicolon)
+    lines = input_data.replace(b";", b",").splitlines()
+
+    if import_format == "joint_angles":
+        return _import_joint_angles(lines, routine)
+    return _import_coordinates(lines, routine)
+
+
+def _import_coordinates(lines, routine):
+    """
+    Create PTP motion statements from coordinate CSV lines.
+
+    Args:
+        lines (list): CSV lines (bytes) with comma separators
+        routine: Visual Components routine object to add statements to
+
+    Returns:
+        int: Number of successfully imported points
+    """
     point_count = 0
-    mtx = vcMatrix.new()  # Reuse matrix object for efficiency
+    add_statement = routine.addStatement
+    ptp_motion = VC_STATEMENT_PTPMOTION
 
-    for line_num, line in enumerate(lines, 1):
-        # Skip empty lines
-        line = line.strip()
-        if not line:
-            continue
+    # Parse and validate every row first, so the statement loop
+    # below only pushes precomputed values into VC
+    rows = _parse_coordinate_rows(lines)
+
+    # Create all motion statements in one pass, then assign their transforms
+    statements = [add_statement(ptp_motion, i) for i in range(len(rows))]
 
-        # Normalize separators (support both comma and semicolon)
-        line = line.replace(";", ",")
-        cells = line.split(",")
+    # Default orientation for rows without W,P,R, built once; only its
+    # translation changes per point, so no identity() reset is needed
+    default_mtx = vcMatrix.new()
+    default_mtx.rotateRelY(180)
 
+    orientations = {}  # (W, P, R) -> matrix already rotated to that orientation
+    for (line_num, x, y, z, wpr), statement in zip(rows, statements):
         try:
-            if import_format == "joint_angles":
-                # Import joint angles
-                if len(cells) < 1:
-                    print(
-                        "Warning: Line %d skipped - insufficient data (need at least one joint)"
-                        % line_num
-                    )
-                    continue
-
-                # Parse all joint angle values (in degrees)
-                joint_angles = []
-                for cell in cells:
-                    val = float(cell.strip())
-                    joint_angles.append(val)
-
-                # Keep joint angles in degrees (VC uses degrees for joint values)
-                # Note: Forward kinematics may need radians, so we'll convert only for FK
-
-                # Try to get robot controller to set joint configuration
-                robot_controller = None
-                robot_app = None
-                try:
-                    # Get the component from the routine's program
-                    if hasattr(routine, "Program") and routine.Program:
-                        program = routine.Program
-                        if hasattr(program, "Component"):
-                            robot_controller = program.Component
-                            # Get the robot application
-                            if robot_controller and hasattr(
-                                robot_controller, "Application"
-                            ):
-                                robot_app = robot_controller.Application
-                except Exception as e:
-                    print("Debug: Could not get robot controller: %s" % str(e))
-
-                # Create motion statement
-                statement = routine.addStatement(VC_STATEMENT_PTPMOTION, point_count)
-
-                # Set joint values
-                try:
-                    if len(statement.Positions) > 0:
-                        position = statement.Positions[0]
-                        success = False
-
-                        # Debug: Print available attributes for first point
-                        if point_count == 0:
-                            print("Debug - Position attributes: %s" % dir(position))
-                            if hasattr(position, "Frame"):
-                                print("Debug - Has Frame")
-                                frame = position.Frame
-                                print("Debug - Frame attributes: %s" % dir(frame))
-                                if hasattr(frame, "JointValues"):
-                                    print(
-                                        "Debug - Frame has JointValues: %s"
-                                        % frame.JointValues
-                                    )
-                                if hasattr(frame, "JointConfiguration"):
-                                    print("Debug - Frame has JointConfiguration")
-
-                        # First try: Use forward kinematics to calculate Cartesian position
-                        if robot_app:
-                            try:
-                                # Convert to radians only for FK (FK typically expects radians)
-                                joint_values_rad_for_fk = [
-                                    math.radians(angle) for angle in joint_angles
-                                ]
-
-                                if hasattr(robot_app, "FK"):
-                                    transform = robot_app.FK(joint_values_rad_for_fk)
-                                    if transform:
-                                        position.PositionInReference = transform
-                                        print(
-                                            "Imported joint values for point %d: %d joints (via FK)"
-                                            % (point_count, len(joint_angles))
-                                        )
-                                        success = True
-                                elif hasattr(robot_app, "forwardKinematics"):
-                                    transform = robot_app.forwardKinematics(
-                                        joint_values_rad_for_fk
-                                    )
-                                    if transform:
-                                        position.PositionInReference = transform
-                                        print(
-                                            "Imported joint values for point %d: %d joints (via forwardKinematics)"
-                                            % (point_count, len(joint_angles))
-                                        )
-                                        success = True
-                            except Exception as e:
-                                print(
-                                    "Warning: FK/forwardKinematics failed: %s" % str(e)
-                                )
-                                if (
-                                    point_count == 0
-                                ):  # Print full trace only for first point
-                                    import traceback
+            # Set up transformation matrix
+            if wpr:
+                # Teach paths often repeat orientations, so build each distinct
+                # rotation once and only move its translation per point
+                wpr_mtx = orientations.get(wpr)
+                if wpr_mtx is None:
+                    if len(orientations) >= _MAX_CACHED_ORIENTATIONS:
+                        orientations.clear()
+                    wpr_mtx = vcMatrix.new()
+                    wpr_mtx.setWPR(*wpr)
+                    orientations[wpr] = wpr_mtx
+                wpr_mtx.P = vcVector.new(x, y, z)
+                point_mtx = wpr_mtx
+            else:
+                default_mtx.P = vcVector.new(x, y, z)
+                point_mtx = default_mtx
+
+            # Apply transformation to statement
+            statement.Positions[0].PositionInReference = point_mtx
+            point_count += 1
+        except Exception as e:
+            print("Error: Line %d - unexpected error: %s" % (line_num, str(e)))
+
+    return point_count
+
 
-                                    traceback.print_exc()
+def _import_joint_angles(lines, routine):
+    """
+    Create PTP motion statements from joint angle CSV lines.
+
+    Args:
+        lines (list): CSV lines (bytes) with comma separators
+        routine: Visual Components routine object to add statements to
 
-                        # Try setting joint values on the position/statement directly
-                        if not success:
-                            try:
-                                # Debug: Print input values
+    Returns:
+        int: Number of successfully imported points
+    """
+    point_count = 0
+    add_statement = routine.addStatement
+    ptp_motion = VC_STATEMENT_PTPMOTION
+
+    # Resolve the robot application and its FK method once for all rows
+    robot_app = _get_robot_application(routine)
+    fk_fn = None
+    fk_name = None
+    if robot_app:
+        if hasattr(robot_app, "FK"):
+            fk_fn, fk_name = robot_app.FK, "FK"
+        elif hasattr(robot_app, "forwardKinematics"):
+            fk_fn, fk_name = robot_app.forwardKinematics, "forwardKinematics"
+
+    failed_lines = []  # Lines whose joint values could not be set
+    first_error_trace = None  # Traceback of the first failure (DEBUG only)
+    set_joints = None  # Direct joint assignment strategy, kept after first success
+
+    # Parse and validate every row first
+    rows = _parse_joint_rows(lines)
+
+    # Create all motion statements in one pass, then assign their joint values
+    statements = [add_statement(ptp_motion, i) for i in range(len(rows))]
+
+    for (line_num, joint_angles), statement in zip(rows, statements):
+        try:
+            # Keep joint angles in degrees (VC uses degrees for joint values)
+            # Note: Forward kinematics may need radians, so we'll convert only for FK
+
+            # Set joint values
+            success = False
+            try:
+                if len(statement.Positions) > 0:
+                    position = statement.Positions[0]
+
+                    # Debug: Print available attributes for first point
+                    if DEBUG and point_count == 0:
+                        print("Debug - Position attributes: %s" % dir(position))
+                        if hasattr(position, "Frame"):
+                            print("Debug - Has Frame")
+                            frame = position.Frame
+                            print("Debug - Frame attributes: %s" % dir(frame))
+                            if hasattr(frame, "JointValues"):
                                 print(
-                                    "Debug - Input joint angles (degrees): %s"
-                                    % joint_angles
+                                    "Debug - Frame has JointValues: %s"
+                                    % frame.JointValues
                                 )
+                            if hasattr(frame, "JointConfiguration"):
+                                print("Debug - Frame has JointConfiguration")
+
+                    # First try: Use forward kinematics to calculate Cartesian position
+                    if fk_fn:
+                        try:
+                            # Convert to radians only for FK (FK typically expects radians)
+                            joint_values_rad_for_fk = list(
+                                map(_DEG2RAD.__mul__, joint_angles)
+                            )
 
-                                # Try using setJoints method first (use degrees)
-                                if hasattr(position, "setJoints"):
+                            transform = fk_fn(joint_values_rad_for_fk)
+                            if transform:
+                                position.PositionInReference = transform
+                                if DEBUG:
                                     print(
-                                        "Debug - Calling position.setJoints() with degrees"
+                                        "Imported joint values for point %d: %d joints (via %s)"
+                                        % (point_count, len(joint_angles), fk_name)
                                     )
-                                    position.setJoints(joint_angles)
-                                    success = True
-                                    print("Imported via position.setJoints()")
+                                success = True
+                        except Exception as e:
+                            # FK fails the same way for every point, so stop
+                            # calling it and use direct joint assignment instead
+                            print(
+                                "Warning: %s failed, setting joint values directly: %s"
+                                % (fk_name, str(e))
+                            )
+                            if DEBUG:
+                                traceback.print_exc()
+                            fk_fn = None
+
+                    # Try setting joint values on the position/statement directly
+                    if not success:
+                        try:
+                            if DEBUG:
+                                print(
+                                    "Debug - Input joint angles (degrees): %s"
+                                    % list(joint_angles)
+                                )
 
-                                # Try to set on Position
-                                elif hasattr(position, "JointValues"):
-                                    print(
-                                        "Debug - Trying to set position.JointValues in degrees"
-                                    )
-                                    print(
-                                        "Debug - position.JointValues length: %d"
-                                        % len(position.JointValues)
-                                    )
-                                    for i, val in enumerate(joint_angles):
-                                        if i < len(position.JointValues):
-                                            print(
-                                                "Debug - Setting position.JointValues[%d] = %f (degrees)"
-                                                % (i, val)
-                                            )
-                                            position.JointValues[i] = val
-                                    success = True
-                                    print("Imported via position.JointValues")
-
-                                # Try setting on Frame
-                                elif hasattr(position, "Frame") and position.Frame:
-                                    frame = position.Frame
-                                    if (
-                                        hasattr(frame, "JointValues")
-                                        and frame.JointValues
-                                    ):
-                                        print(
-                                            "Debug - Trying to set frame.JointValues in degrees"
-                                        )
-                                        for i, val in enumerate(joint_angles):
-                                            if i < len(frame.JointValues):
-                                                frame.JointValues[i] = val
-                                        success = True
-                                        print("Imported via frame.JointValues")
-
-                                    elif (
-                                        hasattr(frame, "JointConfiguration")
-                                        and frame.JointConfiguration
-                                    ):
-                                        print(
-                                            "Debug - Trying to set frame.JointConfiguration in degrees"
-                                        )
-                                        for i, val in enumerate(joint_angles):
-                                            if i < len(frame.JointConfiguration):
-                                                frame.JointConfiguration[i] = val
-                                        success = True
-                                        print("Imported via frame.JointConfiguration")
-                            except Exception as e:
+                            # All positions share one type, so keep the assignment
+                            # strategy once it has worked and reuse it afterwards
+                            setter = set_joints or _choose_joint_setter(position)
+
+                            if setter and setter(position, joint_angles):
+                                success = True
+                                set_joints = setter
+                                if DEBUG:
+                                    print("Imported via %s" % setter.__name__)
+                        except Exception as e:
+                            if DEBUG:
                                 print(
                                     "Warning: Direct joint value setting failed: %s"
                                     % str(e)
                                 )
 
-                        if not success:
-                            print(
-                                "Warning: Line %d - Could not set joint values for point %d"
-                                % (line_num, point_count)
-                            )
-
-                except Exception as e:
+            except Exception as e:
+                if DEBUG:
                     print(
                         "Warning: Line %d - Could not set joint values: %s"
                         % (line_num, str(e))
                     )
-                    import traceback
+                    # Keep the first trace only; it is printed after the loop
+                    if first_error_trace is None:
+                        first_error_trace = traceback.format_exc()
 
-                    traceback.print_exc()
+            if not success:
+                failed_lines.append(line_num)
 
-                point_count += 1
+            point_count += 1
+
+        except Exception as e:
+            print("Error: Line %d - unexpected error: %s" % (line_num, str(e)))
+            continue
+
+    # Report joint assignment failures once instead of per point
+    if first_error_trace:
+        print(first_error_trace)
+    if failed_lines:
+        print(
+            "Warning: Could not set joint values for %d points (first on line %d)"
+            % (len(failed_lines), failed_lines[0])
+        )
+
+    return point_count
+
+
+def _assign_joint_values(target, joint_angles):
+    """Copy joint angles into a joint value collection, up to its length."""
+    size = len(target)
+    for i, val in enumerate(joint_angles):
+        if i >= size:
+            break
+        target[i] = val
+
+
+def _set_via_set_joints(position, joint_angles):
+    """Set joint angles (degrees) with position.setJoints()."""
+    position.setJoints(list(joint_angles))
+    return True
 
-            else:  # coordinates
-                # Import coordinates (original behavior)
-                # Skip lines with insufficient data
-                if len(cells) < 3:
-                    print(
-                        "Warning: Line %d skipped - insufficient data (need at least X,Y,Z)"
-                        % line_num
-                    )
-                    continue
-
-                # Parse position coordinates
-                x, y, z = [float(cell.strip()) for cell in cells[:3]]
-
-                # Create motion statement
-                statement = routine.addStatement(VC_STATEMENT_PTPMOTION, point_count)
-
-                # Set up transformation matrix
-                mtx.identity()
-                mtx.translateRel(x, y, z)
-
-                # Parse orientation if available (W,P,R in degrees)
-                if len(cells) >= 6:
-                    try:
-                        w, p, r = [float(cell.strip()) for cell in cells[3:6]]
-                        mtx.setWPR(w, p, r)
-                    except ValueError:
-                        print(
-                            "Warning: Line %d - invalid orientation data, using default"
-                            % line_num
-                        )
-                        mtx.rotateRelY(180)  # Default orientation
-                else:
-                    # Default orientation for position-only data
-                    mtx.rotateRelY(180)
-
-                # Apply transformation to statement
-                statement.Positions[0].PositionInReference = mtx
-                point_count += 1
 
+def _set_via_position_joint_values(position, joint_angles):
+    """Set joint angles (degrees) on position.JointValues."""
+    joint_values = position.JointValues
+    _assign_joint_values(joint_values, joint_angles)
+    return True
+
+
+def _set_via_frame_joint_values(position, joint_angles):
+    """Set joint angles (degrees) on position.Frame.JointValues."""
+    frame = position.Frame
+    joint_values = frame.JointValues if frame else None
+    if not joint_values:
+        return False
+    _assign_joint_values(joint_values, joint_angles)
+    return True
+
+
+def _set_via_frame_joint_config(position, joint_angles):
+    """Set joint angles (degrees) on position.Frame.JointConfiguration."""
+    frame = position.Frame
+    joint_config = frame.JointConfiguration if frame else None
+    if not joint_config:
+        return False
+    _assign_joint_values(joint_config, joint_angles)
+    return True
+
+
+def _choose_joint_setter(position):
+    """
+    Choose how joint values are assigned to positions of this type.
+
+    Args:
+        position: Sample Visual Components position object
+
+    Returns:
+        function: One of the _set_via_* strategies, or None if the position
+        exposes no way to set joint values
+    """
+    if hasattr(position, "setJoints"):
+        return _set_via_set_joints
+    if hasattr(position, "JointValues"):
+        return _set_via_position_joint_values
+    if hasattr(position, "Frame") and position.Frame:
+        frame = position.Frame
+        if hasattr(frame, "JointValues") and frame.JointValues:
+            return _set_via_frame_joint_values
+        if hasattr(frame, "JointConfiguration") and frame.JointConfiguration:
+            return _set_via_frame_joint_config
+    return None
+
+
+def _get_robot_application(routine):
+    """
+    Get the robot application of the component that owns a routine.
+
+    Args:
+        routine: Visual Components routine object
+
+    Returns:
+        Robot application object, or None if it cannot be resolved
+    """
+    try:
+        # Get the component from the routine's program
+        if hasattr(routine, "Program") and routine.Program:
+            program = routine.Program
+            if hasattr(program, "Component"):
+                robot_controller = program.Component
+                # Get the robot application
+                if robot_controller and hasattr(robot_controller, "Application"):
+                    return robot_controller.Application
+    except Exception as e:
+        print("Debug: Could not get robot controller: %s" % str(e))
+    return None
+
+
+def _read_cells(lines):
+    """
+    Split CSV lines into cells with the csv module's C reader.
+
+    Quotes are not treated specially, so every input line yields exactly one
+    row. Empty and whitespace-only lines are skipped, and lines the reader
+    rejects (e.g. ones containing NUL bytes) are reported and skipped.
+
+    Args:
+        lines (list): CSV lines (bytes) with comma separators
+
+    Yields:
+        tuple: (line_num, cells) for each non-empty line
+    """
+    if bytes is str:
+        reader = csv.reader(lines, quoting=csv.QUOTE_NONE)
+    else:
+        # Python 3's csv module reads text, not bytes
+        reader = csv.reader(
+            (line.decode("latin-1") for line in lines), quoting=csv.QUOTE_NONE
+        )
+
+    line_num = 0
+    while True:
+        line_num += 1
+        try:
+            cells = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            print("Error: Line %d - invalid CSV data: %s" % (line_num, str(e)))
+            continue
+
+        if not cells or (len(cells) == 1 and not cells[0].strip()):
+            continue
+        yield line_num, cells
+
+
+def _parse_coordinate_rows(lines):
+    """
+    Parse coordinate CSV lines into transform inputs.
+
+    Lines with insufficient or invalid position data are reported and
+    skipped; invalid orientation data falls back to the default orientation.
+
+    Args:
+        lines (list): CSV lines (bytes) with comma separators
+
+    Returns:
+        list: (line_num, x, y, z, wpr) tuples, where wpr is a (W, P, R)
+        tuple in degrees or None for the default orientation
+    """
+    rows = []
+    for line_num, cells in _read_cells(lines):
+
+        # Skip lines with insufficient data
+        if len(cells) < 3:
+            print(
+                "Warning: Line %d skipped - insufficient data (need at least X,Y,Z)"
+                % line_num
+            )
+            continue
+
+        # Parse position coordinates
+        try:
+            x, y, z = map(float, cells[:3])
         except ValueError as e:
             print("Error: Line %d - invalid numeric data: %s" % (line_num, str(e)))
             continue
-        except Exception as e:
-            print("Error: Line %d - unexpected error: %s" % (line_num, str(e)))
+
+        # Parse orientation if available (W,P,R in degrees)
+        wpr = None
+        if len(cells) >= 6:
+            try:
+                wpr = tuple(map(float, cells[3:6]))
+            except ValueError:
+                print(
+                    "Warning: Line %d - invalid orientation data, using default"
+                    % line_num
+                )
+
+        rows.append((line_num, x, y, z, wpr))
+
+    return rows
+
+
+def _parse_joint_rows(lines):
+    """
+    Parse joint angle CSV lines.
+
+    Lines with invalid numeric data are reported and skipped.
+
+    Args:
+        lines (list): CSV lines (bytes) with comma separators
+
+    Returns:
+        list: (line_num, joint_angles) tuples, joint angles in degrees
+        stored as array.array("d") to avoid one float object per value
+    """
+    rows = []
+    for line_num, cells in _read_cells(lines):
+        if len(cells) < 1:
+            print(
+                "Warning: Line %d skipped - insufficient data (need at least one joint)"
+                % line_num
+            )
             continue
 
-    return point_count
+        # Parse all joint angle values (in degrees)
+        try:
+            rows.append((line_num, array.array("d", map(float, cells))))
+        except ValueError as e:
+            print("Error: Line %d - invalid numeric data: %s" % (line_num, str(e)))
+
+    return rows
 
 
 addState(None)
@@ -50,16 +50,13 @@ def testScript(arg):
         main = executor.Program.MainRoutine
         
         for statement in main.Statements:
-            if statement.Type == 'Path':
-                # Path statements may not have Kind attribute
-                name = statement.Name if hasattr(statement, 'Name') else 'Unknown'
-                if hasattr(statement, 'Kind'):
-                    print(name, statement.Kind)
-                else:
-                    print(name, statement.Type)
+            name = getattr(statement, 'Name', 'Unknown')
+            stmt_type = getattr(statement, 'Type', 'Unknown')
+            # Path statements may not have Kind attribute
+            kind = getattr(statement, 'Kind', None) if stmt_type == 'Path' else None
+            if kind is not None:
+                print(name, kind)
             else:
-                name = statement.Name if hasattr(statement, 'Name') else 'Unknown'
-                stmt_type = statement.Type if hasattr(statement, 'Type') else 'Unknown'
                 print(name, stmt_type)
     except Exception as e:
         print("Error executing test script: %s" % str(e))